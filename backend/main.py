@@ -1,15 +1,41 @@
 from fastapi import FastAPI, BackgroundTasks, HTTPException, Request ,Form
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-import uuid
-import time
+from starlette.datastructures import UploadFile
+from sse_starlette.sse import EventSourceResponse
+from contextlib import aclosing, AsyncExitStack
+from dataclasses import dataclass, asdict
 import spacy
 from google import genai
 from dotenv import load_dotenv
 import os
+import asyncio
 import boto3
 import json
+import orjson
 import random
+import hashlib
+import functools
+import multiprocessing
+from typing import NamedTuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from aiolimiter import AsyncLimiter
+from ulid import ULID
+
+try:
+    from python_multipart.multipart import MultipartParser, MultipartState, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, MultipartState, parse_options_header
+
+from nlp_worker import init_nlp_worker, segment_script
+from stores import create_job_store, create_redis_client, PromptCache, TERMINAL_STATUSES
+
+# Prefer the asyncio-native AWS SDK so Bedrock/S3 calls don't tie up a worker thread;
+# fall back to plain boto3 (run in a thread) when it isn't installed.
+try:
+    import aioboto3
+except Exception:
+    aioboto3 = None
 
 # Optional Bytez client import (only used for the bytez route)
 try:
@@ -27,33 +53,67 @@ AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 AWS_REGION = os.getenv("AWS_REGION")
 S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME")
 BYTEZ_API_KEY = os.getenv("BYTEZ_API_KEY")  # optional
+REDIS_URL = os.getenv("REDIS_URL")  # optional; required when running more than one worker
+# The rule-based sentencizer takes well under a millisecond per script, so one or two
+# workers per uvicorn process is plenty
+NLP_WORKERS = int(os.getenv("NLP_WORKERS", "1"))
+JOB_CACHE_MAX = int(os.getenv("JOB_CACHE_MAX", "10000"))  # in-process store only; Redis keys expire on their own
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_HOURS", "6")) * 3600
+JOB_SWEEP_INTERVAL_SECONDS = 300
+# Comfortably longer than prompt generation plus the 10 minute clip polling window
+STATUS_STREAM_MAX_SECONDS = 30 * 60
+STATUS_STREAM_RECHECK_SECONDS = 60
+MAX_FORM_BODY_BYTES = int(os.getenv("MAX_FORM_BODY_BYTES", str(100 * 1024 * 1024)))
+# Same per-field and field-count limits Starlette applies to request.form()
+MAX_FORM_FIELD_BYTES = 1024 * 1024
+MAX_FORM_PARTS = 1000
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+GEMINI_REQUESTS_PER_SECOND = float(os.getenv("GEMINI_REQUESTS_PER_SECOND", "2"))
+BEDROCK_POLL_INITIAL_SECONDS = 10
+BEDROCK_POLL_MAX_SECONDS = 60
+BEDROCK_SUBMIT_WORKERS = int(os.getenv("BEDROCK_SUBMIT_WORKERS", "4"))
+BEDROCK_SUBMITS_PER_SECOND = float(os.getenv("BEDROCK_SUBMITS_PER_SECOND", "1"))
+GEMINI_MODEL = "gemini-2.5-flash"
 
 # Initialize AWS clients
+aws_session = None
 s3_client = None
 bedrock_runtime = None
 
 if AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY:
     try:
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-            region_name=AWS_REGION
-        )
-        # Initialize the Bedrock Runtime client for T2V
-        bedrock_runtime = boto3.client(
-            'bedrock-runtime',
-            aws_access_key_id=AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-            region_name=AWS_REGION
-        )
-        print("INFO: AWS S3 and Bedrock clients initialized.")
+        if aioboto3:
+            aws_session = aioboto3.Session(
+                aws_access_key_id=AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+                region_name=AWS_REGION
+            )
+            print("INFO: aioboto3 session initialized for S3 and Bedrock.")
+        else:
+            s3_client = boto3.client(
+                's3',
+                aws_access_key_id=AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+                region_name=AWS_REGION
+            )
+            # Initialize the Bedrock Runtime client for T2V
+            bedrock_runtime = boto3.client(
+                'bedrock-runtime',
+                aws_access_key_id=AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+                region_name=AWS_REGION
+            )
+            print("INFO: AWS S3 and Bedrock clients initialized (sync boto3 fallback).")
     except Exception as e:
         print(f"ERROR: Failed to initialize AWS clients. Check credentials/region. {e}")
+        aws_session = None
         s3_client = None
+        bedrock_runtime = None
 else:
     print("WARNING: AWS Credentials are missing. S3/Bedrock integration will be skipped.")
 
+AWS_AVAILABLE = aws_session is not None or bedrock_runtime is not None
+
 # Initialize Gemini Client
 if GEMINI_API_KEY:
     ai_client = genai.Client(api_key=GEMINI_API_KEY)
@@ -61,12 +121,25 @@ else:
     print("WARNING: GEMINI_API_KEY not found. LLM prompting will be skipped.")
     ai_client = None
 
+# Shared across jobs: caps in-flight Gemini calls and smooths them into a token bucket
+gemini_semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+gemini_limiter = AsyncLimiter(GEMINI_REQUESTS_PER_SECOND, 1)
+
+# Nova Reel submissions from every job go through one queue drained by a fixed
+# pool of workers, sharing a token bucket sized to the Bedrock QPS quota
+bedrock_submit_q: asyncio.Queue = asyncio.Queue(maxsize=256)
+bedrock_limiter = AsyncLimiter(BEDROCK_SUBMITS_PER_SECOND, 1)
+_bedrock_submit_workers: list[asyncio.Task] = []
+
+# Dedicated generator for Nova Reel seeds, seeded once from OS entropy
+_seed_gen = random.Random()
+
 # Initialize Spacy NLP
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
+# Parsing runs in a process pool (started on app startup) so it never holds the
+# event loop; each worker loads the model once via nlp_worker.init_nlp_worker.
+NLP_AVAILABLE = spacy.util.is_package("en_core_web_sm")
+if not NLP_AVAILABLE:
     print("WARNING: Spacy model 'en_core_web_sm' not found. Script analysis will be basic.")
-    nlp = None
 
 # Initialize Bytez SDK (if available)
 sdk_bytez = None
@@ -103,41 +176,235 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-class VideoRequest(BaseModel):
+@app.on_event("startup")
+async def start_nlp_pool():
+    app.state.nlp_pool = None
+    if NLP_AVAILABLE:
+        # Spawn rather than fork: the loop already has threads (to_thread, the DNS
+        # resolver) and forking a multi-threaded process can deadlock the child
+        app.state.nlp_pool = ProcessPoolExecutor(
+            max_workers=NLP_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_nlp_worker
+        )
+
+
+@app.on_event("shutdown")
+async def stop_nlp_pool():
+    if app.state.nlp_pool:
+        app.state.nlp_pool.shutdown(wait=False, cancel_futures=True)
+
+
+@app.on_event("startup")
+async def open_aws_clients():
+    # One client per service for the app's lifetime so HTTPS connections (and
+    # their TLS handshakes) are reused across jobs instead of per call
+    global AWS_AVAILABLE
+    app.state.aws_stack = AsyncExitStack()
+    app.state.s3 = None
+    app.state.bedrock = None
+    if aws_session:
+        try:
+            app.state.s3 = await app.state.aws_stack.enter_async_context(aws_session.client('s3'))
+            app.state.bedrock = await app.state.aws_stack.enter_async_context(aws_session.client('bedrock-runtime'))
+        except Exception as e:
+            print(f"ERROR: Failed to initialize AWS clients. Check credentials/region. {e}")
+            await app.state.aws_stack.aclose()
+            app.state.s3 = None
+            app.state.bedrock = None
+            # Keeps the submit workers from starting and makes polling report the missing client
+            AWS_AVAILABLE = False
+    else:
+        app.state.s3 = s3_client
+        app.state.bedrock = bedrock_runtime
+
+
+@app.on_event("startup")
+async def start_bedrock_submit_workers():
+    if AWS_AVAILABLE:
+        for _ in range(BEDROCK_SUBMIT_WORKERS):
+            _bedrock_submit_workers.append(asyncio.create_task(_bedrock_submit_worker()))
+
+
+@app.on_event("shutdown")
+async def stop_bedrock_submit_workers():
+    for worker in _bedrock_submit_workers:
+        worker.cancel()
+    await asyncio.gather(*_bedrock_submit_workers, return_exceptions=True)
+    _bedrock_submit_workers.clear()
+
+
+@app.on_event("shutdown")
+async def close_aws_clients():
+    # Registered after the submit workers' hook so they stop before the clients close
+    app.state.s3 = None
+    app.state.bedrock = None
+    await app.state.aws_stack.aclose()
+
+
+async def _sweep_finished_jobs():
+    while True:
+        await asyncio.sleep(JOB_SWEEP_INTERVAL_SECONDS)
+        try:
+            removed = await job_store.sweep(JOB_RETENTION_SECONDS)
+            if removed:
+                print(f"INFO: Swept {removed} finished job(s) past retention.")
+        except Exception as e:
+            print(f"WARNING: Job sweep failed: {e}")
+
+
+@app.on_event("startup")
+async def start_job_sweeper():
+    app.state.job_sweeper = asyncio.create_task(_sweep_finished_jobs())
+
+
+@app.on_event("shutdown")
+async def stop_job_sweeper():
+    sweeper = getattr(app.state, "job_sweeper", None)
+    if sweeper:
+        sweeper.cancel()
+        await asyncio.gather(sweeper, return_exceptions=True)
+
+
+# Built from already-validated form strings, so a plain slotted dataclass is enough
+@dataclass(slots=True, frozen=True)
+class VideoRequest:
     script: str
     style: str
 
-# Global dictionary to track job statuses
-job_status = {}
+# Job statuses and cached prompts live in Redis when REDIS_URL is set so every worker shares them
+redis_client = create_redis_client(REDIS_URL)
+job_store = create_job_store(redis_client, local_maxsize=JOB_CACHE_MAX)
+prompt_cache = PromptCache(redis_client)
+if redis_client is not None:
+    print("INFO: Job statuses and prompt cache are stored in Redis.")
+else:
+    print("WARNING: REDIS_URL not set (or redis not installed). Job statuses are kept in this process only.")
+
+def new_job_id() -> str:
+    """Time-ordered ULID, so job keys sort (and scan) by creation time."""
+    return str(ULID())
+
 
 # --- helpers to extract multipart form-data (like your frontend sends) ---
+class _UploadMeta(NamedTuple):
+    """Filename/content type of an upload whose bytes were skipped while streaming."""
+    filename: str
+    content_type: str | None
+
+
 async def _extract_form_payload(request: Request):
+    content_type, params = parse_options_header(request.headers.get("content-type"))
+    if content_type == b"multipart/form-data" and b"boundary" in params:
+        return await _stream_multipart_payload(request, params[b"boundary"])
+
     form = await request.form()
     text_fields = {}
     files = []
     for key, value in form.multi_items():
         # UploadFile instances come from form data
         # do not attempt to read file content here — just capture metadata/filename
-        try:
-            from starlette.datastructures import UploadFile as StarletteUploadFile
-            is_file = isinstance(value, StarletteUploadFile)
-        except Exception:
-            is_file = False
-
-        if is_file:
+        if isinstance(value, UploadFile):
             files.append(value)
         else:
             text_fields[key] = value
     return text_fields, files
 
+
+async def _stream_multipart_payload(request: Request, boundary: bytes):
+    """Parses multipart form data straight off the request stream.
+
+    Text fields are collected as usual, but upload bodies are dropped as they
+    arrive — only the filename and content type are kept — so large attachments
+    never get buffered in memory or spooled to /tmp.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_FORM_BODY_BYTES:
+        raise HTTPException(413, "Request body too large.")
+
+    text_fields = {}
+    files = []
+    part = {}
+    header_field = bytearray()
+    header_value = bytearray()
+
+    def on_part_begin():
+        if len(text_fields) + len(files) >= MAX_FORM_PARTS:
+            raise HTTPException(400, f"Too many fields. Maximum number of fields is {MAX_FORM_PARTS}.")
+        part.clear()
+        part["headers"] = {}
+        part["data"] = bytearray()
+
+    def on_header_field(data, start, end):
+        header_field.extend(data[start:end])
+
+    def on_header_value(data, start, end):
+        header_value.extend(data[start:end])
+
+    def on_header_end():
+        part["headers"][bytes(header_field).lower()] = bytes(header_value)
+        header_field.clear()
+        header_value.clear()
+
+    def on_headers_finished():
+        _, options = parse_options_header(part["headers"].get(b"content-disposition"))
+        part["name"] = options.get(b"name", b"").decode("utf-8", errors="replace")
+        filename = options.get(b"filename")
+        part["filename"] = filename.decode("utf-8", errors="replace") if filename is not None else None
+
+    def on_part_data(data, start, end):
+        if part["filename"] is None:
+            if len(part["data"]) + (end - start) > MAX_FORM_FIELD_BYTES:
+                raise HTTPException(400, f"Field exceeded maximum size of {MAX_FORM_FIELD_BYTES // 1024}KB.")
+            part["data"].extend(data[start:end])
+
+    def on_part_end():
+        if part["filename"] is None:
+            text_fields[part["name"]] = part["data"].decode("utf-8", errors="replace")
+        else:
+            part_content_type = part["headers"].get(b"content-type")
+            files.append(_UploadMeta(
+                filename=part["filename"],
+                content_type=part_content_type.decode("latin-1") if part_content_type else None
+            ))
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > MAX_FORM_BODY_BYTES:
+            raise HTTPException(413, "Request body too large.")
+        try:
+            parser.write(chunk)
+        except HTTPException:
+            raise
+        except Exception as exc:
+            raise HTTPException(400, f"Invalid multipart data: {exc}")
+    parser.finalize()
+    if parser.state != MultipartState.END:
+        raise HTTPException(400, "Invalid multipart data: body ended before the closing boundary.")
+
+    return text_fields, files
+
+# Form fields consumed by the endpoints themselves; everything else is echoed back as metadata
+_RESERVED_FORM_KEYS = frozenset({"prompt", "style", "script", "tool", "model"})
+
+
 def _attachment_meta(files):
+    # Both UploadFile and _UploadMeta expose filename/content_type directly
     return [
-        {
-            "name": f.filename,
-            "content_type": f.content_type if hasattr(f, "content_type") else None,
-        }
+        {"name": f.filename, "content_type": f.content_type}
         for f in files
-        if getattr(f, "filename", None)
+        if f.filename
     ]
 
 
@@ -201,95 +468,205 @@ def _normalize_text_output(output):
     return str(output)
 
 
+# --- HELPER FUNCTIONS FOR GEMINI PROMPTING ---
+@functools.lru_cache(maxsize=64)
+def _build_system_instruction(style: str) -> str:
+    return (
+        "You are an expert cinematic storyboard artist. "
+        f"Convert the following scene description into a single, hyper-detailed, technical, "
+        f"and vivid text-to-video prompt, using the visual style: '{style}'. "
+        f"Focus on visual movement and rich detail. The final prompt should be less than 512 characters. "
+        f"The output must be ONLY the prompt text, nothing else."
+    )
+
+
+def _prompt_cache_key(style: str, scene_text: str) -> str:
+    return hashlib.blake2b((style + "\x00" + scene_text.strip().lower()).encode()).hexdigest()
+
+
 # --- HELPER FUNCTIONS FOR BEDROCK T2V ---
-def poll_bedrock_job(invocation_arn: str) -> dict:
-    """Checks the status of the asynchronous Bedrock T2V job."""
-    if not bedrock_runtime:
-        return {"status": "FAILED", "video_url": None, "message": "Bedrock client not initialized."}
+# Service name -> attribute on app.state holding the long-lived client
+_AWS_CLIENT_ATTRS = {'s3': 's3', 'bedrock-runtime': 'bedrock'}
+
+
+async def _aws_call(service_name: str, method: str, **kwargs):
+    """Runs a single S3/Bedrock API call on the app-lifetime client without blocking the event loop."""
+    client = getattr(app.state, _AWS_CLIENT_ATTRS[service_name], None)
+    if client is None:
+        raise RuntimeError(f"AWS client for {service_name} is not open.")
+
+    if aws_session:
+        return await getattr(client, method)(**kwargs)
+    return await asyncio.to_thread(getattr(client, method), **kwargs)
+
+
+class _BedrockSubmission(NamedTuple):
+    kwargs: dict
+    future: asyncio.Future
+
+
+async def _bedrock_submit_worker():
+    while True:
+        item = await bedrock_submit_q.get()
+        try:
+            # The job awaiting this clip is gone; don't start a render nobody will collect
+            if item.future.cancelled():
+                continue
+            await bedrock_limiter.acquire()
+            response = await _aws_call('bedrock-runtime', 'start_async_invoke', **item.kwargs)
+            if not item.future.done():
+                item.future.set_result(response['invocationArn'])
+        except Exception as e:
+            if not item.future.done():
+                item.future.set_exception(e)
+        finally:
+            bedrock_submit_q.task_done()
+
+
+async def submit_bedrock_invocation(**kwargs) -> str:
+    """Queues a start_async_invoke call and waits for a worker to return its invocation ARN."""
+    if not _bedrock_submit_workers:
+        raise RuntimeError("Bedrock submit workers are not running.")
+    future = asyncio.get_running_loop().create_future()
+    await bedrock_submit_q.put(_BedrockSubmission(kwargs, future))
+    return await future
+
+
+async def poll_bedrock_job(invocation_arn: str) -> dict:
+    """Checks the status of the asynchronous Bedrock T2V job.
+
+    Completed clips report their invocation ID; URLs are pre-signed once polling ends.
+    """
+    if not AWS_AVAILABLE:
+        return {"status": "FAILED", "invocation_id": None, "message": "Bedrock client not initialized."}
     
     try:
-        response = bedrock_runtime.get_async_invoke(
+        response = await _aws_call(
+            'bedrock-runtime',
+            'get_async_invoke',
             invocationArn=invocation_arn
         )
         status = response.get("status", "Unknown")
         
         if status == "Completed":
-            arn_parts = invocation_arn.split('/')
-            invocation_id = arn_parts[-1] 
-            final_s3_key = f"jobs/{invocation_id}/output.mp4"
-            presigned_url = s3_client.generate_presigned_url(
-                ClientMethod='get_object',
-                Params={'Bucket': S3_BUCKET_NAME, 'Key': final_s3_key},
-                ExpiresIn=3600 
-            )
-            return {"status": "COMPLETED", "video_url": presigned_url, "message": "Video generated and URL pre-signed."}
+            invocation_id = invocation_arn.split('/')[-1]
+            return {"status": "COMPLETED", "invocation_id": invocation_id, "message": "Video generated."}
         
         elif status == "Failed":
-            return {"status": "FAILED", "video_url": None, "message": response.get('failureMessage', 'Unknown failure.')}
+            return {"status": "FAILED", "invocation_id": None, "message": response.get('failureMessage', 'Unknown failure.')}
             
-        return {"status": "IN_PROGRESS", "video_url": None, "message": f"Job status: {status}"}
+        return {"status": "IN_PROGRESS", "invocation_id": None, "message": f"Job status: {status}"}
         
     except Exception as e:
-        return {"status": "FAILED", "video_url": None, "message": f"Polling error: {str(e)}"}
+        return {"status": "FAILED", "invocation_id": None, "message": f"Polling error: {str(e)}"}
+
+
+async def presign_clip_url(invocation_id: str) -> str:
+    final_s3_key = f"jobs/{invocation_id}/output.mp4"
+    return await _aws_call(
+        's3',
+        'generate_presigned_url',
+        ClientMethod='get_object',
+        Params={'Bucket': S3_BUCKET_NAME, 'Key': final_s3_key},
+        ExpiresIn=3600 
+    )
+
+
+# --- CORE BACKGROUND TASK ---
+async def generate_video_task(job_id: str, request: VideoRequest):
+    try:
+        await _run_video_job(job_id, request)
+    except Exception as e:
+        # Anything unexpected still has to end the job, or status streams wait on it forever
+        print(f"Job {job_id} crashed: {e}")
+        await job_store.update(job_id, {'status': 'FAILED', 'progress': f"Unexpected error: {e}"})
 
 
-# --- CORE BACKGROUND TASK (UNCHANGED LOGIC) ---
-def generate_video_task(job_id: str, request: VideoRequest):
-    # (This function is copied unchanged from your code)
+async def _segment_scenes(script: str) -> list[str]:
+    nlp_pool = getattr(app.state, "nlp_pool", None)
+    if nlp_pool:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(nlp_pool, segment_script, script)
+        except BrokenProcessPool as e:
+            # A worker died (e.g. spacy.load failed in init_nlp_worker); the pool can't recover
+            print(f"WARNING: NLP pool is broken, falling back to basic script analysis. {e}")
+            nlp_pool.shutdown(wait=False)
+            app.state.nlp_pool = None
+        except Exception as e:
+            print(f"WARNING: Script analysis failed, falling back to basic split. {e}")
+    return script.split(". ")
+
+
+async def _run_video_job(job_id: str, request: VideoRequest):
     print(f"Starting job {job_id} for script: {request.script[:30]}...")
     
-    job_status[job_id]['status'] = "ANALYZING_SCRIPT"
-    scenes = []
-
-    if nlp:
-        doc = nlp(request.script)
-        scenes = [sent.text for sent in doc.sents]
-    else:
-        scenes = request.script.split(". ") 
+    await job_store.update(job_id, {'status': "ANALYZING_SCRIPT"})
+    scenes = await _segment_scenes(request.script)
     
-    time.sleep(1) 
-    job_status[job_id]['status'] = 'GENERATING_PROMPTS'
+    await asyncio.sleep(1) 
+    await job_store.update(job_id, {'status': 'GENERATING_PROMPTS'})
     generated_prompts = []
 
     if ai_client and scenes:
-        for i, scene_text in enumerate(scenes):
-            system_instruction = (
-                "You are an expert cinematic storyboard artist. "
-                f"Convert the following scene description into a single, hyper-detailed, technical, "
-                f"and vivid text-to-video prompt, using the visual style: '{request.style}'. "
-                f"Focus on visual movement and rich detail. The final prompt should be less than 512 characters. "
-                f"The output must be ONLY the prompt text, nothing else."
-            )
-            
+        config = {"system_instruction": _build_system_instruction(request.style)}
+
+        async def _one(i: int, scene_text: str) -> str:
+            cache_key = _prompt_cache_key(request.style, scene_text)
+            # The cache is only an optimization; if Redis is down, just ask Gemini
             try:
-                response = ai_client.models.generate_content(
-                    model="gemini-2.5-flash",
+                cached_prompt = await prompt_cache.get(cache_key)
+            except Exception as e:
+                print(f"WARNING: Prompt cache lookup failed: {e}")
+                cached_prompt = None
+            if cached_prompt is not None:
+                print(f"--- CACHED PROMPT for Scene {i + 1} ---")
+                return cached_prompt
+
+            async with gemini_semaphore:
+                await gemini_limiter.acquire()
+                response = await ai_client.aio.models.generate_content(
+                    model=GEMINI_MODEL,
                     contents=scene_text,
-                    config={"system_instruction": system_instruction}
+                    config=config
                 )
-                
-                generated_prompts.append(response.text[:512]) 
-                print(f"--- GENERATED PROMPT for Scene {i + 1} ---\n{response.text[:100]}...\n------------------------")
-                time.sleep(1)
+
+            print(f"--- GENERATED PROMPT for Scene {i + 1} ---\n{response.text[:100]}...\n------------------------")
+            prompt = response.text[:512]
+            try:
+                await prompt_cache.set(cache_key, prompt)
             except Exception as e:
-                print(f"Error generating prompt: {e}")
+                print(f"WARNING: Prompt cache write failed: {e}")
+            return prompt
+
+        # gather preserves input order, so prompts stay aligned with their scenes
+        results = await asyncio.gather(
+            *(_one(i, scene_text) for i, scene_text in enumerate(scenes)),
+            return_exceptions=True
+        )
+        for scene_text, result in zip(scenes, results):
+            if isinstance(result, BaseException):
+                print(f"Error generating prompt: {result}")
                 generated_prompts.append(f"A detailed scene of {scene_text[:50]} in {request.style} style.")
+            else:
+                generated_prompts.append(result)
     
     num_clips = len(generated_prompts)
     if num_clips == 0:
-        job_status[job_id]['status'] = 'FAILED'
-        job_status[job_id]['progress'] = 'Failed to generate any prompts from script.'
+        await job_store.update(job_id, {
+            'status': 'FAILED',
+            'progress': 'Failed to generate any prompts from script.'
+        })
         return
 
-    job_status[job_id]['status'] = 'INVOKING_BEDROCK'
+    await job_store.update(job_id, {'status': 'INVOKING_BEDROCK'})
     invocation_arns = []
     
     s3_output_uri = f"s3://{S3_BUCKET_NAME}/jobs/" 
     
-    if bedrock_runtime:
-        for i, prompt in enumerate(generated_prompts):
-            job_status[job_id]['progress'] = f"Submitting clip {i + 1}/{num_clips} to Nova Reel..."
-            
+    if AWS_AVAILABLE:
+        await job_store.update(job_id, {'progress': f"Submitting {num_clips} clip(s) to Nova Reel..."})
+        submissions = []
+        for prompt in generated_prompts:
             model_input = {
                 "taskType": "TEXT_VIDEO",
                 "textToVideoParams": {"text": prompt},
@@ -297,60 +674,93 @@ def generate_video_task(job_id: str, request: VideoRequest):
                     "durationSeconds": 6, 
                     "fps": 24,
                     "dimension": "1280x720",
-                    "seed": random.randint(0, 2147483646)
+                    "seed": _seed_gen.randrange(2147483647)
                 },
             }
-            
-            try:
-                response = bedrock_runtime.start_async_invoke(
-                    modelId="amazon.nova-reel-v1:0",
-                    modelInput=model_input,
-                    outputDataConfig={"s3OutputDataConfig": {"s3Uri": s3_output_uri}}
-                )
-                invocation_arns.append(response['invocationArn'])
-            except Exception as e:
-                print(f"Bedrock Invocation Error for clip {i + 1}: {e}")
-                invocation_arns.append(None) 
-            
-            time.sleep(2) 
+            submissions.append(submit_bedrock_invocation(
+                modelId="amazon.nova-reel-v1:0",
+                modelInput=model_input,
+                outputDataConfig={"s3OutputDataConfig": {"s3Uri": s3_output_uri}}
+            ))
+
+        results = await asyncio.gather(*submissions, return_exceptions=True)
+        for i, result in enumerate(results):
+            if isinstance(result, BaseException):
+                print(f"Bedrock Invocation Error for clip {i + 1}: {result}")
+                invocation_arns.append(None)
+            else:
+                invocation_arns.append(result)
 
-    job_status[job_id]['status'] = 'POLLING_CLIPS'
-    clip_urls = []
+    await job_store.update(job_id, {'status': 'POLLING_CLIPS'})
+    clip_urls = [None] * num_clips
     max_wait_time_minutes = 10
-    start_time = time.time()
-    
-    while time.time() - start_time < (max_wait_time_minutes * 60) and len(clip_urls) < num_clips:
-        for i in range(len(clip_urls), num_clips): 
-            arn = invocation_arns[i]
-            if arn:
-                result = poll_bedrock_job(arn)
-                if result['status'] == "COMPLETED":
-                    clip_urls.append(result['video_url'])
-                    job_status[job_id]['progress'] = f"Clip {i + 1}/{num_clips} Completed."
-                elif result['status'] == "FAILED":
-                    clip_urls.append("FAILED_CLIP")
-                    job_status[job_id]['progress'] = f"Clip {i + 1}/{num_clips} FAILED: {result['message']}"
-                elif result['status'] == "IN_PROGRESS":
-                    job_status[job_id]['progress'] = f"Waiting on Clip {i + 1}/{num_clips}. Current status: {result['message']}."
-            else:
-                clip_urls.append("FAILED_CLIP")
-        if len(clip_urls) == num_clips:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_wait_time_minutes * 60
+
+    # Clips that never got an ARN are already terminal; the rest back off independently
+    for i in range(num_clips):
+        if i >= len(invocation_arns) or not invocation_arns[i]:
+            clip_urls[i] = "FAILED_CLIP"
+    pending = {i for i in range(num_clips) if clip_urls[i] is None}
+    completed_ids = {}
+    poll_interval = dict.fromkeys(pending, BEDROCK_POLL_INITIAL_SECONDS)
+    next_poll_at = dict.fromkeys(pending, loop.time() + BEDROCK_POLL_INITIAL_SECONDS)
+
+    while pending:
+        await asyncio.sleep(max(0.0, min(min(next_poll_at[i] for i in pending), deadline) - loop.time()))
+        now = loop.time()
+        if now >= deadline:
             break
-        time.sleep(15)
+
+        due = [i for i in pending if now >= next_poll_at[i]]
+        results = await asyncio.gather(*(poll_bedrock_job(invocation_arns[i]) for i in due))
+        for i, result in zip(due, results):
+            if result['status'] == "COMPLETED":
+                completed_ids[i] = result['invocation_id']
+                pending.discard(i)
+                await job_store.update(job_id, {'progress': f"Clip {i + 1}/{num_clips} Completed."})
+            elif result['status'] == "FAILED":
+                clip_urls[i] = "FAILED_CLIP"
+                pending.discard(i)
+                await job_store.update(job_id, {'progress': f"Clip {i + 1}/{num_clips} FAILED: {result['message']}"})
+            else:
+                poll_interval[i] = min(poll_interval[i] * 2, BEDROCK_POLL_MAX_SECONDS)
+                next_poll_at[i] = loop.time() + poll_interval[i]
+                await job_store.update(job_id, {
+                    'progress': f"Waiting on Clip {i + 1}/{num_clips}. Current status: {result['message']}."
+                })
+
+    # Sign every finished clip in one pass so all URLs expire an hour after the job completes
+    completed = sorted(completed_ids.items())
+    presigned = await asyncio.gather(
+        *(presign_clip_url(invocation_id) for _, invocation_id in completed),
+        return_exceptions=True
+    )
+    for (i, _), url in zip(completed, presigned):
+        if isinstance(url, BaseException):
+            print(f"Pre-signing error for clip {i + 1}: {url}")
+            clip_urls[i] = "FAILED_CLIP"
+        else:
+            clip_urls[i] = url
 
     successful_clips = [url for url in clip_urls if url and url != "FAILED_CLIP"]
     
     if successful_clips:
+        final_status = 'COMPLETED'
         final_video_url = successful_clips[0] 
-        job_status[job_id]['status'] = 'COMPLETED'
-        job_status[job_id]['video_url'] = final_video_url
-        job_status[job_id]['progress'] = f"Assembly complete. {len(successful_clips)}/{num_clips} clips successful."
+        progress = f"Assembly complete. {len(successful_clips)}/{num_clips} clips successful."
     else:
-        job_status[job_id]['status'] = 'FAILED'
-        job_status[job_id]['video_url'] = None
-        job_status[job_id]['progress'] = 'T2V generation failed for all clips.'
+        final_status = 'FAILED'
+        final_video_url = None
+        progress = 'T2V generation failed for all clips.'
+
+    await job_store.update(job_id, {
+        'status': final_status,
+        'video_url': final_video_url,
+        'progress': progress
+    })
 
-    print(f"Job {job_id} FINAL STATUS: {job_status[job_id]['status']}. URL: {job_status[job_id]['video_url']}")
+    print(f"Job {job_id} FINAL STATUS: {final_status}. URL: {final_video_url}")
 
 
 # --- FASTAPI ENDPOINTS (NEW API LAYOUT) ---
@@ -367,24 +777,25 @@ async def api_video_nova(request: Request, background_tasks: BackgroundTasks):
     prompt = text_fields.get("prompt", "") or text_fields.get("script", "")
     style = text_fields.get("style", text_fields.get("model", "default-style"))
 
-    job_id = str(uuid.uuid4())
+    job_id = new_job_id()
     video_request = VideoRequest(script=prompt, style=style)
 
-    job_status[job_id] = {
+    job = {
         'status': 'QUEUED',
         'progress': 'Awaiting generation...',
         'video_url': None,
-        'request': video_request.dict(),
+        'request': asdict(video_request),
         'attachments': _attachment_meta(uploads),
-        'metadata': {k: v for k, v in text_fields.items() if k not in {"prompt", "style", "script", "tool", "model"}}
+        'metadata': {k: v for k, v in text_fields.items() if k not in _RESERVED_FORM_KEYS}
     }
+    await job_store.set(job_id, job)
 
     background_tasks.add_task(generate_video_task, job_id, video_request)
 
     return {
         "job_id": job_id,
-        "status": job_status[job_id]['status'],
-        "progress": job_status[job_id]['progress'],
+        "status": job['status'],
+        "progress": job['progress'],
         "prompt": prompt,
         "style": style
     }
@@ -529,8 +940,10 @@ async def generate_bytez_task(job_id: str, prompt: str, model_slug: str, tool: s
     Handles single/multiple images and videos in a unified way.
     """
     try:
-        job_status[job_id]['status'] = "IN_PROGRESS"
-        job_status[job_id]['progress'] = f"Generating using Bytez model: {model_slug} ..."
+        await job_store.update(job_id, {
+            'status': "IN_PROGRESS",
+            'progress': f"Generating using Bytez model: {model_slug} ..."
+        })
 
         if not sdk_bytez:
             raise Exception("Bytez SDK not initialized.")
@@ -546,16 +959,16 @@ async def generate_bytez_task(job_id: str, prompt: str, model_slug: str, tool: s
         key = "video_url" if is_video else "image_urls"
 
         if error:
-            job_status[job_id]['status'] = "FAILED"
-            job_status[job_id]['progress'] = str(error)
-            job_status[job_id][key] = None
+            await job_store.update(job_id, {'status': "FAILED", 'progress': str(error), key: None})
             return
 
         if is_video:
             # Video: expect output to be a single URL string
-            job_status[job_id]['status'] = "COMPLETED"
-            job_status[job_id]['progress'] = "Video generated successfully"
-            job_status[job_id]['video_url'] = output
+            await job_store.update(job_id, {
+                'status': "COMPLETED",
+                'progress': "Video generated successfully",
+                'video_url': output
+            })
         else:
             # Image: normalize output into a list of URLs
             image_urls = []
@@ -571,15 +984,15 @@ async def generate_bytez_task(job_id: str, prompt: str, model_slug: str, tool: s
             elif isinstance(output, dict) and "url" in output and isinstance(output["url"], str):
                 image_urls = [output["url"]]
 
-            job_status[job_id]['status'] = "COMPLETED"
-            job_status[job_id]['progress'] = f"{len(image_urls)} image(s) generated"
-            job_status[job_id]['image_urls'] = image_urls
+            await job_store.update(job_id, {
+                'status': "COMPLETED",
+                'progress': f"{len(image_urls)} image(s) generated",
+                'image_urls': image_urls
+            })
 
     except Exception as e:
         key = "video_url" if tool.lower() == "video" else "image_urls"
-        job_status[job_id]['status'] = "FAILED"
-        job_status[job_id]['progress'] = str(e)
-        job_status[job_id][key] = None
+        await job_store.update(job_id, {'status': "FAILED", 'progress': str(e), key: None})
 
 
 @app.post("/api/text/{model_slug:path}")
@@ -633,15 +1046,15 @@ async def api_bytez_universal(
         raise HTTPException(503, "Bytez SDK not initialized.")
 
     # Prepare job
-    job_id = str(uuid.uuid4())
-    job_status[job_id] = {
+    job_id = new_job_id()
+    await job_store.set(job_id, {
         "status": "QUEUED",
         "progress": "Waiting to start...",
         "video_url": None,
         "image_urls": None,
         "model_slug": model_slug,
         "tool": tool
-    }
+    })
 
     # Add background task with tool parameter
     background_tasks.add_task(generate_bytez_task, job_id, prompt, model_slug, tool)
@@ -657,13 +1070,57 @@ async def api_bytez_universal(
 # Status and health endpoints (match frontend API_ENDPOINTS.status)
 @app.get("/status/{job_id}")
 async def get_video_status(job_id: str):
-    if job_id not in job_status:
+    job = await job_store.get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job ID not found")
-    return job_status[job_id]
+    return job
+
+
+@app.get("/status/{job_id}/stream")
+async def stream_video_status(job_id: str):
+    """Server-sent events: pushes the job snapshot on every change until it finishes.
+
+    The stream also ends if the job disappears or STATUS_STREAM_MAX_SECONDS pass,
+    so a job that never reaches a terminal status can't hold the connection open.
+    """
+    if await job_store.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job ID not found")
+
+    async def event_source():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + STATUS_STREAM_MAX_SECONDS
+        async with aclosing(job_store.subscribe(job_id)) as updates:
+            next_update = None
+            try:
+                while loop.time() < deadline:
+                    if next_update is None:
+                        next_update = asyncio.ensure_future(anext(updates))
+                    # asyncio.wait (unlike wait_for) leaves the pending read running on timeout
+                    timeout = min(STATUS_STREAM_RECHECK_SECONDS, deadline - loop.time())
+                    done, _ = await asyncio.wait({next_update}, timeout=timeout)
+                    if done:
+                        job = next_update.result()
+                        next_update = None
+                    else:
+                        # Nothing published for a while: the key may have expired or the task died
+                        job = await job_store.get(job_id)
+                        if job is None:
+                            break
+                        if job.get("status") not in TERMINAL_STATUSES:
+                            continue
+                    yield {"data": orjson.dumps(job).decode()}
+                    if job.get("status") in TERMINAL_STATUSES:
+                        break
+            finally:
+                if next_update is not None:
+                    next_update.cancel()
+                    await asyncio.gather(next_update, return_exceptions=True)
+
+    return EventSourceResponse(event_source())
 
 @app.get("/health")
 async def health():
-    return {"ok": True, "jobs": len(job_status)}
+    return {"ok": True, "jobs": await job_store.count()}
 
 
 if __name__ == "__main__":
@@ -7,13 +7,19 @@ exercised on a laptop without AWS, OpenAI, or Google credentials.
 
 from __future__ import annotations
 
+import asyncio
 import itertools
+import os
 import random
-import uuid
-from typing import Any, Dict, List, Tuple
+import time
+from typing import Any, Dict, List, Literal, Tuple
 
+import orjson
+from cachetools import TTLCache
 from fastapi import FastAPI, HTTPException, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from sse_starlette.sse import EventSourceResponse
+from ulid import ULID
 
 # --- Mock data lifecycle ------------------------------------------------------
 
@@ -34,9 +40,18 @@ STATUS_FLOW: List[Tuple[str, str]] = [
     ("COMPLETED", "Assembly complete. 3/3 clips successful."),
 ]
 
+STREAM_STEP_SECONDS = 1.5
+# Form fields the routes consume directly; the rest is returned as metadata
+_RESERVED_FORM_KEYS = frozenset({"prompt", "tool", "model"})
+
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_HOURS", "6")) * 3600
+JOB_SWEEP_INTERVAL_SECONDS = 300
+
 JobPayload = Dict[str, Any]
-jobs: Dict[str, JobPayload] = {}
+# TTL + LRU bound keeps a long-running mock from accumulating every job it ever saw
+jobs: TTLCache = TTLCache(maxsize=int(os.getenv("JOB_CACHE_MAX", "10000")), ttl=86400)
 job_counter = itertools.count(1)
+_seed_gen = random.Random()
 
 
 async def _extract_form_payload(request: Request) -> tuple[Dict[str, str], List[UploadFile]]:
@@ -53,52 +68,82 @@ async def _extract_form_payload(request: Request) -> tuple[Dict[str, str], List[
     return text_fields, files
 
 
-def _create_job(payload: JobPayload) -> str:
-    job_id = str(uuid.uuid4())
-    jobs[job_id] = {
-        "step": 0,
-        "status": STATUS_FLOW[0][0],
-        "progress": STATUS_FLOW[0][1],
+def _build_snapshot(step: int, job: JobPayload) -> JobPayload:
+    """Materializes the /status response for one step of the job's lifecycle."""
+    status, progress = STATUS_FLOW[step]
+    snapshot: JobPayload = {
+        "status": status,
+        "progress": progress,
         "video_url": None,
         "image_urls": None,
         "variations": None,
+        "prompt": job["prompt"],
+        "model": job["model"],
+        "tool": job["tool"],
+        "attachments": job["attachments"],
+        "metadata": job["metadata"],
+    }
+    if status == "COMPLETED":
+        if job["tool"] == "video":
+            snapshot["video_url"] = MOCK_VIDEO_URL
+        else:
+            base_url = job["base_url"]
+            variation_seed = job["variation_seed"]
+            snapshot["image_urls"] = [
+                f"{base_url}?auto=format&seed={variation_seed}&frame=0",
+                f"{base_url}?auto=format&seed={variation_seed}&frame=1",
+            ]
+            snapshot["variations"] = [
+                {
+                    "id": f"{variation_seed}-a",
+                    "url": f"{base_url}?auto=format&fit=crop&w=1024&var=a",
+                },
+                {
+                    "id": f"{variation_seed}-b",
+                    "url": f"{base_url}?auto=format&fit=crop&w=1024&var=b",
+                },
+            ]
+    return snapshot
+
+
+def _create_job(payload: JobPayload) -> str:
+    job_ulid = ULID()
+    job_id = str(job_ulid)
+    job: JobPayload = {
+        "step": 0,
         "prompt": payload.get("prompt", ""),
         "model": payload.get("model"),
         "tool": payload.get("tool", "video"),
         "attachments": payload.get("attachments", []),
         "metadata": payload.get("metadata", {}),
         "job_number": next(job_counter),
+        "created_at": time.monotonic(),
+        "base_url": _seed_gen.choice(IMAGE_PLACEHOLDERS),
+        "variation_seed": f"{job_ulid.milliseconds:x}"[-6:],
     }
+    # Every status response is built up front; polling just walks the tuple
+    job["timeline"] = tuple(_build_snapshot(step, job) for step in range(len(STATUS_FLOW)))
+    jobs[job_id] = job
     return job_id
 
 
+def _current_snapshot(job: JobPayload) -> JobPayload:
+    return job["timeline"][job["step"]]
+
+
 def _advance_job(job: JobPayload) -> JobPayload:
-    step = job["step"]
-    if step < len(STATUS_FLOW) - 1:
-        step += 1
-        job["step"] = step
-        job["status"], job["progress"] = STATUS_FLOW[step]
-        if STATUS_FLOW[step][0] == "COMPLETED":
-            if job["tool"] == "video":
-                job["video_url"] = MOCK_VIDEO_URL
-            else:
-                base_url = random.choice(IMAGE_PLACEHOLDERS)
-                variation_seed = uuid.uuid4().hex[:6]
-                job["image_urls"] = [
-                    f"{base_url}?auto=format&seed={variation_seed}&frame=0",
-                    f"{base_url}?auto=format&seed={variation_seed}&frame=1",
-                ]
-                job["variations"] = [
-                    {
-                        "id": f"{variation_seed}-a",
-                        "url": f"{base_url}?auto=format&fit=crop&w=1024&var=a",
-                    },
-                    {
-                        "id": f"{variation_seed}-b",
-                        "url": f"{base_url}?auto=format&fit=crop&w=1024&var=b",
-                    },
-                ]
-    return job
+    job["step"] = min(job["step"] + 1, len(job["timeline"]) - 1)
+    return job["timeline"][job["step"]]
+
+
+async def _sweep_finished_jobs() -> None:
+    while True:
+        await asyncio.sleep(JOB_SWEEP_INTERVAL_SECONDS)
+        cutoff = time.monotonic() - JOB_RETENTION_SECONDS
+        jobs.expire()
+        for job_id, job in list(jobs.items()):
+            if job["step"] == len(job["timeline"]) - 1 and job["created_at"] < cutoff:
+                jobs.pop(job_id, None)
 
 
 def _attachment_meta(files: List[UploadFile]) -> List[Dict[str, Any]]:
@@ -130,53 +175,32 @@ app.add_middleware(
 )
 
 
-# --- Routes -------------------------------------------------------------------
+@app.on_event("startup")
+async def start_job_sweeper() -> None:
+    app.state.job_sweeper = asyncio.create_task(_sweep_finished_jobs())
 
-@app.post("/api/video/{model_slug}")
-async def enqueue_video(model_slug: str, request: Request):
-    text_fields, uploads = await _extract_form_payload(request)
-    prompt = text_fields.get("prompt", "")
-    tool = text_fields.get("tool", "video")
-    model = text_fields.get("model", model_slug)
-    metadata = {
-        key: value
-        for key, value in text_fields.items()
-        if key not in {"prompt", "tool", "model"}
-    }
-    attachments = _attachment_meta(uploads)
 
-    job_id = _create_job(
-        {
-            "prompt": prompt,
-            "model": model,
-            "tool": tool,
-            "attachments": attachments,
-            "metadata": metadata,
-        }
-    )
+@app.on_event("shutdown")
+async def stop_job_sweeper() -> None:
+    app.state.job_sweeper.cancel()
+    await asyncio.gather(app.state.job_sweeper, return_exceptions=True)
 
-    return {
-        "job_id": job_id,
-        "status": jobs[job_id]["status"],
-        "progress": jobs[job_id]["progress"],
-        "prompt": prompt,
-        "model": model,
-        "tool": tool,
-        "attachments": attachments,
-        "metadata": metadata,
-    }
 
+# --- Routes -------------------------------------------------------------------
 
-@app.post("/api/image/{model_slug}")
-async def generate_image(model_slug: str, request: Request):
+@app.post("/api/{route_tool}/{model_slug}")
+async def enqueue_job(
+    route_tool: Literal["video", "image"], model_slug: str, request: Request
+):
+    """Shared handler for /api/video/... and /api/image/...; the path picks the default tool."""
     text_fields, uploads = await _extract_form_payload(request)
     prompt = text_fields.get("prompt", "")
-    tool = text_fields.get("tool", "image")
+    tool = text_fields.get("tool", route_tool)
     model = text_fields.get("model", model_slug)
     metadata = {
         key: value
         for key, value in text_fields.items()
-        if key not in {"prompt", "tool", "model"}
+        if key not in _RESERVED_FORM_KEYS
     }
     attachments = _attachment_meta(uploads)
 
@@ -189,11 +213,12 @@ async def generate_image(model_slug: str, request: Request):
             "metadata": metadata,
         }
     )
+    snapshot = _current_snapshot(jobs[job_id])
 
     return {
         "job_id": job_id,
-        "status": jobs[job_id]["status"],
-        "progress": jobs[job_id]["progress"],
+        "status": snapshot["status"],
+        "progress": snapshot["progress"],
         "prompt": prompt,
         "model": model,
         "tool": tool,
@@ -208,19 +233,23 @@ async def get_video_status(job_id: str):
     if not job:
         raise HTTPException(status_code=404, detail="Job ID not found")
 
-    job = _advance_job(job)
-    return {
-        "status": job["status"],
-        "progress": job["progress"],
-        "video_url": job.get("video_url"),
-        "image_urls": job.get("image_urls"),
-        "variations": job.get("variations"),
-        "prompt": job["prompt"],
-        "model": job["model"],
-        "tool": job["tool"],
-        "attachments": job["attachments"],
-        "metadata": job["metadata"],
-    }
+    return _advance_job(job)
+
+
+@app.get("/status/{job_id}/stream")
+async def stream_video_status(job_id: str):
+    """Server-sent events version of /status: advances the job on a timer instead of per poll."""
+    job = jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job ID not found")
+
+    async def event_source():
+        yield {"data": orjson.dumps(_current_snapshot(job)).decode()}
+        while job["step"] < len(job["timeline"]) - 1:
+            await asyncio.sleep(STREAM_STEP_SECONDS)
+            yield {"data": orjson.dumps(_advance_job(job)).decode()}
+
+    return EventSourceResponse(event_source())
 
 
 @app.get("/health")
@@ -0,0 +1,32 @@
+"""spaCy scene segmentation for the NLP process pool.
+
+Kept apart from main.py so spawned pool workers only import spaCy, not the
+API module with its AWS, Gemini and Redis clients.
+"""
+
+import spacy
+
+nlp = None
+
+
+def _load_nlp():
+    # Only sentence boundaries are needed, so skip loading the statistical components
+    # and let the rule-based sentencizer provide doc.sents.
+    pipeline = spacy.load(
+        "en_core_web_sm",
+        exclude=["tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer", "ner"]
+    )
+    pipeline.add_pipe("sentencizer")
+    return pipeline
+
+
+def init_nlp_worker():
+    global nlp
+    nlp = _load_nlp()
+
+
+def segment_script(script: str) -> list[str]:
+    """Splits a script into scene sentences; runs inside an NLP pool worker."""
+    if nlp is None:
+        return script.split(". ")
+    return [sent.text for sent in nlp(script).sents]
@@ -0,0 +1,262 @@
+"""Job status and prompt cache storage shared by the API workers.
+
+`RedisJobStore` keeps each job in a Redis hash (`job:{job_id}`) with a TTL so
+every uvicorn worker sees the same state and finished jobs expire on their
+own. Every write is also pushed to `subscribe()` iterators so status changes
+can be streamed to clients instead of polled. `PromptCache` remembers
+generated scene prompts so repeat scenes skip the LLM call. Both fall back to
+in-process storage for local runs when REDIS_URL isn't configured.
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+from cachetools import TTLCache
+
+try:
+    import redis.asyncio as redis_asyncio
+except Exception:
+    redis_asyncio = None
+
+JOB_TTL_SECONDS = 86400
+JOB_LOCAL_MAXSIZE = 10000
+TERMINAL_STATUSES = frozenset({"COMPLETED", "FAILED"})
+PROMPT_CACHE_TTL_SECONDS = 7 * 86400
+PROMPT_CACHE_LOCAL_MAXSIZE = 1024
+
+JobPayload = Dict[str, Any]
+
+
+class JobStore:
+    """Minimal async interface the endpoints and background tasks talk to."""
+
+    async def get(self, job_id: str) -> Optional[JobPayload]:
+        raise NotImplementedError
+
+    async def set(self, job_id: str, job: JobPayload) -> None:
+        raise NotImplementedError
+
+    async def update(self, job_id: str, fields: JobPayload) -> None:
+        raise NotImplementedError
+
+    async def count(self) -> int:
+        raise NotImplementedError
+
+    def subscribe(self, job_id: str) -> AsyncIterator[JobPayload]:
+        """Yields the current job snapshot, then a fresh snapshot after every write."""
+        raise NotImplementedError
+
+    async def sweep(self, retention_seconds: float) -> int:
+        """Drops finished jobs older than the retention window; returns how many were removed."""
+        return 0
+
+
+class _JobCache(TTLCache):
+    """TTL cache that, when full, evicts the oldest finished job before any running one."""
+
+    def popitem(self):
+        for job_id in list(self):
+            if self[job_id].get("status") in TERMINAL_STATUSES:
+                return job_id, self.pop(job_id)
+        job_id, job = super().popitem()
+        print(f"WARNING: Job store full of running jobs; evicted {job_id} while {job.get('status')}.")
+        return job_id, job
+
+
+class InMemoryJobStore(JobStore):
+    """Bounded by a TTL + size-capped cache so a long-lived process doesn't grow without limit."""
+
+    def __init__(self, maxsize: int = JOB_LOCAL_MAXSIZE, ttl_seconds: int = JOB_TTL_SECONDS) -> None:
+        self._jobs: TTLCache = _JobCache(maxsize=maxsize, ttl=ttl_seconds)
+        self._finished_at: Dict[str, float] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    async def get(self, job_id: str) -> Optional[JobPayload]:
+        job = self._jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+    async def set(self, job_id: str, job: JobPayload) -> None:
+        self._jobs[job_id] = dict(job)
+        self._mark_finished(job_id, job)
+        self._publish(job_id)
+
+    async def update(self, job_id: str, fields: JobPayload) -> None:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.update(fields)
+            self._mark_finished(job_id, job)
+            self._publish(job_id)
+
+    async def count(self) -> int:
+        self._jobs.expire()
+        return len(self._jobs)
+
+    async def sweep(self, retention_seconds: float) -> int:
+        self._jobs.expire()
+        cutoff = time.monotonic() - retention_seconds
+        removed = 0
+        for job_id, finished_at in list(self._finished_at.items()):
+            if job_id not in self._jobs:
+                # Already evicted by the TTL/size policy
+                del self._finished_at[job_id]
+            elif finished_at < cutoff:
+                del self._jobs[job_id]
+                del self._finished_at[job_id]
+                removed += 1
+        return removed
+
+    def _mark_finished(self, job_id: str, job: JobPayload) -> None:
+        if job.get("status") in TERMINAL_STATUSES:
+            self._finished_at.setdefault(job_id, time.monotonic())
+
+    def _publish(self, job_id: str) -> None:
+        for queue in self._subscribers.get(job_id, ()):
+            queue.put_nowait(dict(self._jobs[job_id]))
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[JobPayload]:
+        queue: asyncio.Queue = asyncio.Queue()
+        subscribers = self._subscribers.setdefault(job_id, set())
+        subscribers.add(queue)
+        try:
+            job = await self.get(job_id)
+            if job is not None:
+                yield job
+            while True:
+                yield await queue.get()
+        finally:
+            subscribers.discard(queue)
+            if not subscribers:
+                self._subscribers.pop(job_id, None)
+
+
+class RedisJobStore(JobStore):
+    """Stores each top-level job field as a JSON-encoded hash field.
+
+    Updates only HSET the fields that changed instead of rewriting the whole
+    job, and every write refreshes the key's TTL and publishes the resulting
+    snapshot on `job:{job_id}:events` so subscribers on any worker see it.
+    Job IDs are also indexed in the `jobs:index` sorted set, scored by last
+    write time, so counting jobs never has to scan the keyspace.
+    """
+
+    INDEX_KEY = "jobs:index"
+
+    def __init__(self, client, ttl_seconds: int = JOB_TTL_SECONDS) -> None:
+        self._client = client
+        self._ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"job:{job_id}"
+
+    @staticmethod
+    def _channel(job_id: str) -> str:
+        return f"job:{job_id}:events"
+
+    @staticmethod
+    def _decode(raw: Dict[str, str]) -> JobPayload:
+        return {field: json.loads(value) for field, value in raw.items()}
+
+    def _touch_index(self, pipe, job_id: str) -> None:
+        # Trimmed on every write, and expires along with the last job written to it,
+        # so the index stays bounded even when nothing calls count()
+        now = time.time()
+        pipe.zadd(self.INDEX_KEY, {job_id: now})
+        pipe.zremrangebyscore(self.INDEX_KEY, "-inf", now - self._ttl_seconds)
+        pipe.expire(self.INDEX_KEY, self._ttl_seconds)
+
+    async def get(self, job_id: str) -> Optional[JobPayload]:
+        raw = await self._client.hgetall(self._key(job_id))
+        if not raw:
+            return None
+        return self._decode(raw)
+
+    async def set(self, job_id: str, job: JobPayload) -> None:
+        key = self._key(job_id)
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping={field: json.dumps(value) for field, value in job.items()})
+            pipe.expire(key, self._ttl_seconds)
+            self._touch_index(pipe, job_id)
+            await pipe.execute()
+        await self._client.publish(self._channel(job_id), json.dumps(job))
+
+    async def update(self, job_id: str, fields: JobPayload) -> None:
+        key = self._key(job_id)
+        # Don't resurrect a job that has already expired as a partial hash
+        if not await self._client.exists(key):
+            return
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={field: json.dumps(value) for field, value in fields.items()})
+            pipe.expire(key, self._ttl_seconds)
+            self._touch_index(pipe, job_id)
+            pipe.hgetall(key)
+            *_, raw = await pipe.execute()
+        await self._client.publish(self._channel(job_id), json.dumps(self._decode(raw)))
+
+    async def count(self) -> int:
+        # Index entries older than the TTL belong to hashes Redis has already expired
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(self.INDEX_KEY, "-inf", time.time() - self._ttl_seconds)
+            pipe.zcard(self.INDEX_KEY)
+            _, total = await pipe.execute()
+        return total
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[JobPayload]:
+        pubsub = self._client.pubsub()
+        await pubsub.subscribe(self._channel(job_id))
+        try:
+            job = await self.get(job_id)
+            if job is not None:
+                yield job
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    yield json.loads(message["data"])
+        finally:
+            await pubsub.unsubscribe(self._channel(job_id))
+            await pubsub.aclose()
+
+
+class PromptCache:
+    """Exact-match cache of generated prompts, keyed by a caller-supplied digest."""
+
+    def __init__(self, client=None, ttl_seconds: int = PROMPT_CACHE_TTL_SECONDS) -> None:
+        self._client = client
+        self._ttl_seconds = ttl_seconds
+        self._local: "OrderedDict[str, str]" = OrderedDict()
+
+    @staticmethod
+    def _key(digest: str) -> str:
+        return f"prompt:{digest}"
+
+    async def get(self, digest: str) -> Optional[str]:
+        if self._client is not None:
+            return await self._client.get(self._key(digest))
+        value = self._local.get(digest)
+        if value is not None:
+            self._local.move_to_end(digest)
+        return value
+
+    async def set(self, digest: str, prompt: str) -> None:
+        if self._client is not None:
+            await self._client.set(self._key(digest), prompt, ex=self._ttl_seconds)
+            return
+        self._local[digest] = prompt
+        self._local.move_to_end(digest)
+        while len(self._local) > PROMPT_CACHE_LOCAL_MAXSIZE:
+            self._local.popitem(last=False)
+
+
+def create_redis_client(redis_url: Optional[str]):
+    if redis_url and redis_asyncio:
+        return redis_asyncio.from_url(redis_url, decode_responses=True)
+    return None
+
+
+def create_job_store(client, local_maxsize: int = JOB_LOCAL_MAXSIZE) -> JobStore:
+    if client is not None:
+        return RedisJobStore(client)
+    return InMemoryJobStore(maxsize=local_maxsize)
@@ -1,4 +1,4 @@
-import { useEffect, useRef, useState } from "react";
+import { useCallback, useEffect, useRef, useState } from "react";
 import { motion } from "framer-motion";
 import { Card } from "@/components/ui/card";
 import { StatusTimeline } from "./status-timeline";
@@ -49,67 +49,109 @@ export function StatusPolling({
     lastStatusRef.current = "";
   }, [jobId]);
 
-  useEffect(() => {
-    if (!isPolling || !jobId) return;
+  // Prefer the server-sent event stream; fall back to polling if it can't be opened
+  const [useStream, setUseStream] = useState(
+    () => typeof window !== "undefined" && "EventSource" in window
+  );
 
-    const pollStatus = async () => {
-      try {
-        const response = await fetch(API_ENDPOINTS.status(jobId));
-        if (!response.ok) throw new Error("Failed to fetch status");
+  const handleStatus = useCallback(
+    (data: JobStatus) => {
+      setStatus(data);
+      setFailureCount(0);
 
-        const data: JobStatus = await response.json();
-        setStatus(data);
-        setFailureCount(0);
+      appendJobStatus(sessionId, jobId, data.status, data.progress);
+      updateJob(sessionId, jobId, {
+        status: data.status,
+        progress: data.progress,
+      });
 
-        appendJobStatus(sessionId, jobId, data.status, data.progress);
-        updateJob(sessionId, jobId, {
-          status: data.status,
-          progress: data.progress,
-        });
+      const readableStatus = data.status.replace(/_/g, " ");
+      const statusKey = `${data.status}-${data.progress}`;
+      if (statusKey !== lastStatusRef.current) {
+        appendStatus(
+          sessionId,
+          `${new Date().toLocaleTimeString()} • ${readableStatus} — ${
+            data.progress || ""
+          }`
+        );
+        lastStatusRef.current = statusKey;
+      }
 
-        const readableStatus = data.status.replace(/_/g, " ");
-        const statusKey = `${data.status}-${data.progress}`;
-        if (statusKey !== lastStatusRef.current) {
-          appendStatus(
-            sessionId,
-            `${new Date().toLocaleTimeString()} • ${readableStatus} — ${
-              data.progress || ""
-            }`
-          );
-          lastStatusRef.current = statusKey;
+      if (data.status === "COMPLETED") {
+        if (data.video_url) {
+          updateSession(sessionId, { videoUrl: data.video_url });
+          updateJob(sessionId, jobId, {
+            videoUrl: data.video_url,
+            status: data.status,
+            progress: data.progress,
+          });
         }
-
-        if (data.status === "COMPLETED") {
-          if (data.video_url) {
-            updateSession(sessionId, { videoUrl: data.video_url });
-            updateJob(sessionId, jobId, {
-              videoUrl: data.video_url,
-              status: data.status,
-              progress: data.progress,
-            });
-          }
-          if (data.image_urls) {
-            updateJob(sessionId, jobId, {
-              imageUrls: data.image_urls,
-              status: data.status,
-              progress: data.progress,
-            });
-          }
-          setIsPolling(false);
-          onSuccess(data, jobId);
-        } else if (data.status === "FAILED") {
-          const failureMessage = data.progress || "Generation failed";
+        if (data.image_urls) {
           updateJob(sessionId, jobId, {
-            status: "FAILED",
-            progress: failureMessage,
+            imageUrls: data.image_urls,
+            status: data.status,
+            progress: data.progress,
           });
-          onError(failureMessage, jobId);
-          appendStatus(
-            sessionId,
-            `${new Date().toLocaleTimeString()} • FAILED — ${failureMessage}`
-          );
-          setIsPolling(false);
         }
+        setIsPolling(false);
+        onSuccess(data, jobId);
+      } else if (data.status === "FAILED") {
+        const failureMessage = data.progress || "Generation failed";
+        updateJob(sessionId, jobId, {
+          status: "FAILED",
+          progress: failureMessage,
+        });
+        onError(failureMessage, jobId);
+        appendStatus(
+          sessionId,
+          `${new Date().toLocaleTimeString()} • FAILED — ${failureMessage}`
+        );
+        setIsPolling(false);
+      }
+    },
+    [
+      jobId,
+      onSuccess,
+      onError,
+      appendStatus,
+      updateSession,
+      appendJobStatus,
+      updateJob,
+      sessionId,
+    ]
+  );
+
+  // Keep the stream open across re-renders that only swap callback identities
+  const handleStatusRef = useRef(handleStatus);
+  useEffect(() => {
+    handleStatusRef.current = handleStatus;
+  }, [handleStatus]);
+
+  useEffect(() => {
+    if (!isPolling || !jobId || !useStream) return;
+
+    const source = new EventSource(API_ENDPOINTS.statusStream(jobId));
+    source.onmessage = (event) => {
+      handleStatusRef.current(JSON.parse(event.data) as JobStatus);
+    };
+    source.onerror = () => {
+      source.close();
+      setUseStream(false);
+    };
+
+    return () => source.close();
+  }, [jobId, isPolling, useStream]);
+
+  useEffect(() => {
+    if (!isPolling || !jobId || useStream) return;
+
+    const pollStatus = async () => {
+      try {
+        const response = await fetch(API_ENDPOINTS.status(jobId));
+        if (!response.ok) throw new Error("Failed to fetch status");
+
+        const data: JobStatus = await response.json();
+        handleStatus(data);
       } catch (err) {
         const message = err instanceof Error ? err.message : "Network error";
         appendStatus(
@@ -133,13 +175,12 @@ export function StatusPolling({
   }, [
     jobId,
     isPolling,
+    useStream,
     failureCount,
-    onSuccess,
+    handleStatus,
     onError,
     appendStatus,
-    updateSession,
     appendJobStatus,
-    updateJob,
     sessionId,
   ]);
 
@@ -54,6 +54,7 @@ export const TOOL_ORDER: ToolType[] = ["video", "image", "text"];
 export const API_ENDPOINTS = {
   modelPath: (path: string) => `${API_BASE_URL}${path}`,
   status: (jobId: string) => `${API_BASE_URL}/status/${jobId}`,
+  statusStream: (jobId: string) => `${API_BASE_URL}/status/${jobId}/stream`,
 };
 
 export const getDefaultModel = (tool: ToolType) => {